@@ -1,15 +1,61 @@
 import time
 import logging
-from authlib.common.urls import urlparse
+from anyio import Event
 from .errors import (
     MissingRequestTokenError,
     MissingTokenError,
 )
-from .sync_app import OAuth1Base, OAuth2Base
+from .sync_app import OAuth1Base, OAuth2Base, _is_fresh, _join_api_base_url
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 log = logging.getLogger(__name__)
 
-__all__ = ['AsyncOAuth1Mixin', 'AsyncOAuth2Mixin']
+__all__ = ['AsyncOAuth1Mixin', 'AsyncOAuth2Mixin', 'AsyncTTLCache']
+
+
+class AsyncTTLCache:
+    """A process wide cache with expiration. Concurrent coroutines that
+    ask for the same missing key share a single call of ``load``. The
+    loaded value is reused for ``expires_in`` seconds, and only if it was
+    loaded after ``loaded_after`` when that is given. Returns
+    ``(loaded_at, value)``.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._loading = {}
+
+    async def get(self, key, load, expires_in, loaded_after=None):
+        while True:
+            item = self._data.get(key)
+            if item is not None and _is_fresh(item[0], expires_in, loaded_after):
+                return item
+
+            event = self._loading.get(key)
+            if event is None:
+                break
+            # wait for the running load, it may also have failed
+            await event.wait()
+
+        event = self._loading[key] = Event()
+        try:
+            loaded_at = time.time()
+            item = (loaded_at, await load())
+            self._data[key] = item
+        finally:
+            del self._loading[key]
+            event.set()
+        return item
+
+    def clear(self):
+        self._data.clear()
+
+
+_server_metadata_cache = AsyncTTLCache()
 
 
 class AsyncOAuth1Mixin(OAuth1Base):
@@ -32,9 +78,7 @@ class AsyncOAuth1Mixin(OAuth1Base):
 
         async with self._get_oauth_client() as client:
             client.redirect_uri = redirect_uri
-            params = {}
-            if self.request_token_params:
-                params.update(self.request_token_params)
+            params = self.request_token_params or {}
             request_token = await client.fetch_request_token(self.request_token_url, **params)
             log.debug(f'Fetch request token: {request_token!r}')
             url = client.create_authorization_url(self.authorize_url, **kwargs)
@@ -52,16 +96,16 @@ class AsyncOAuth1Mixin(OAuth1Base):
             if request_token is None:
                 raise MissingRequestTokenError()
             # merge request token with verifier
-            token = {}
-            token.update(request_token)
-            token.update(kwargs)
-            client.token = token
+            client.token = {**request_token, **kwargs}
             params = self.access_token_params or {}
             token = await client.fetch_access_token(self.access_token_url, **params)
         return token
 
 
 class AsyncOAuth2Mixin(OAuth2Base):
+    #: seconds to keep the discovery document of ``server_metadata_url``
+    SERVER_METADATA_EXPIRES_IN = 86400
+
     async def _on_update_token(self, token, refresh_token=None, access_token=None):
         if self._update_token:
             await self._update_token(
@@ -71,15 +115,26 @@ class AsyncOAuth2Mixin(OAuth2Base):
             )
 
     async def load_server_metadata(self):
-        if self._server_metadata_url and '_loaded_at' not in self.server_metadata:
-            async with self.client_cls(**self.client_kwargs) as client:
-                resp = await client.request('GET', self._server_metadata_url, withhold_token=True)
-                resp.raise_for_status()
-                metadata = resp.json()
-                metadata['_loaded_at'] = time.time()
-            self.server_metadata.update(metadata)
+        if self._server_metadata_url:
+            loaded_at = self.server_metadata.get('_loaded_at')
+            expires_in = self.SERVER_METADATA_EXPIRES_IN
+            if loaded_at is None or loaded_at + expires_in <= time.time():
+                _, metadata = await _server_metadata_cache.get(
+                    (self._server_metadata_url, self._connection_key),
+                    self._fetch_server_metadata,
+                    expires_in,
+                )
+                self.server_metadata.update(metadata)
         return self.server_metadata
 
+    async def _fetch_server_metadata(self):
+        async with self.client_cls(**self.client_kwargs) as client:
+            resp = await client.request('GET', self._server_metadata_url, withhold_token=True)
+            resp.raise_for_status()
+            metadata = _load_json(resp)
+            metadata['_loaded_at'] = time.time()
+        return metadata
+
     async def request(self, method, url, token=None, **kwargs):
         metadata = await self.load_server_metadata()
         async with self._get_oauth_client(**metadata) as session:
@@ -118,19 +173,28 @@ class AsyncOAuth2Mixin(OAuth2Base):
         async with self._get_oauth_client(**metadata) as client:
             if redirect_uri is not None:
                 client.redirect_uri = redirect_uri
-            params = {}
             if self.access_token_params:
-                params.update(self.access_token_params)
-            params.update(kwargs)
+                params = {**self.access_token_params, **kwargs}
+            else:
+                params = kwargs
             token = await client.fetch_token(token_endpoint, **params)
         return token
 
 
+def _load_json(resp):
+    # orjson, when installed, parses discovery and JWKS documents faster,
+    # but reads bytes as UTF-8 only; decode other declared charsets first
+    charset = resp.charset_encoding
+    if charset and charset.lower() not in ('utf-8', 'utf8'):
+        return _json_loads(resp.text)
+    return _json_loads(resp.content)
+
+
 async def _http_request(ctx, session, method, url, token, kwargs):
     request = kwargs.pop('request', None)
     withhold_token = kwargs.get('withhold_token')
     if ctx.api_base_url and not url.startswith(('https://', 'http://')):
-        url = urlparse.urljoin(ctx.api_base_url, url)
+        url = _join_api_base_url(ctx, url)
 
     if withhold_token:
         return await session.request(method, url, **kwargs)
@@ -1,72 +1,94 @@
-from authlib.jose import JsonWebToken, JsonWebKey
+import functools
 from authlib.oidc.core import UserInfo, CodeIDToken, ImplicitIDToken
+from .async_app import AsyncTTLCache, _load_json
+from .sync_openid import OpenIDBase
 
 __all__ = ['AsyncOpenIDMixin']
 
+_jwk_set_cache = AsyncTTLCache()
 
-class AsyncOpenIDMixin:
+
+class AsyncOpenIDMixin(OpenIDBase):
     async def fetch_jwk_set(self, force=False):
         metadata = await self.load_server_metadata()
+        return await self._fetch_jwk_set(metadata, force)
+
+    async def _fetch_jwk_set(self, metadata, force=False):
         jwk_set = metadata.get('jwks')
-        if jwk_set and not force:
+        if self._jwk_set_is_usable(jwk_set, force):
             return jwk_set
 
         uri = metadata.get('jwks_uri')
         if not uri:
             raise RuntimeError('Missing "jwks_uri" in metadata')
 
+        loaded_at, jwk_set = await _jwk_set_cache.get(
+            (uri, self._connection_key),
+            functools.partial(self._request_jwk_set, uri),
+            self.JWKS_EXPIRES_IN,
+            self._jwk_set_loaded_after(jwk_set, force),
+        )
+        self._loaded_jwk_set = (jwk_set, loaded_at)
+        self.server_metadata['jwks'] = jwk_set
+        return jwk_set
+
+    async def _request_jwk_set(self, uri):
         async with self.client_cls(**self.client_kwargs) as client:
             resp = await client.request('GET', uri, withhold_token=True)
             resp.raise_for_status()
-            jwk_set = resp.json()
-
-        self.server_metadata['jwks'] = jwk_set
-        return jwk_set
+            return _load_json(resp)
 
     async def userinfo(self, **kwargs):
         """Fetch user info from ``userinfo_endpoint``."""
         metadata = await self.load_server_metadata()
-        resp = await self.get(metadata['userinfo_endpoint'], **kwargs)
+        userinfo_endpoint = metadata.get('userinfo_endpoint')
+        if not userinfo_endpoint:
+            raise RuntimeError('Missing "userinfo_endpoint" value')
+
+        resp = await self.get(userinfo_endpoint, **kwargs)
         resp.raise_for_status()
-        data = resp.json()
+        data = _load_json(resp)
         return UserInfo(data)
 
     async def parse_id_token(self, token, nonce, claims_options=None):
         """Return an instance of UserInfo from token's ``id_token``."""
-        claims_params = dict(
-            nonce=nonce,
-            client_id=self.client_id,
-        )
-        if 'access_token' in token:
-            claims_params['access_token'] = token['access_token']
-            claims_cls = CodeIDToken
-        else:
-            claims_cls = ImplicitIDToken
+        if 'id_token' not in token:
+            return None
 
         metadata = await self.load_server_metadata()
-        if claims_options is None and 'issuer' in metadata:
-            claims_options = {'iss': {'values': [metadata['issuer']]}}
-
         alg_values = metadata.get('id_token_signing_alg_values_supported')
         if not alg_values:
             alg_values = ['RS256']
 
-        jwt = JsonWebToken(alg_values)
+        jwt = self._get_jwt(alg_values)
+        jwk_set = await self._fetch_jwk_set(metadata)
+
+        if claims_options is None and 'issuer' in metadata:
+            claims_options = {'iss': {'values': [metadata['issuer']]}}
+
+        claims_params = {'nonce': nonce, 'client_id': self.client_id}
+        if 'access_token' in token:
+            claims_params['access_token'] = token['access_token']
+            claims_cls = CodeIDToken
+        else:
+            claims_cls = ImplicitIDToken
+
+        def load_key(header, _):
+            return self._find_key(jwk_set, header.get('kid'))
 
-        jwk_set = await self.fetch_jwk_set()
         try:
             claims = jwt.decode(
                 token['id_token'],
-                key=JsonWebKey.import_key_set(jwk_set),
+                key=load_key,
                 claims_cls=claims_cls,
                 claims_options=claims_options,
                 claims_params=claims_params,
             )
         except ValueError:
-            jwk_set = await self.fetch_jwk_set(force=True)
+            jwk_set = await self._fetch_jwk_set(metadata, force=True)
             claims = jwt.decode(
                 token['id_token'],
-                key=JsonWebKey.import_key_set(jwk_set),
+                key=load_key,
                 claims_cls=claims_cls,
                 claims_options=claims_options,
                 claims_params=claims_params,
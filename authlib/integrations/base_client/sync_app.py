@@ -12,6 +12,29 @@ from .errors import (
 log = logging.getLogger(__name__)
 
 
+class TTLCache:
+    """A process wide cache with expiration. The loaded value is reused
+    for ``expires_in`` seconds, and only if it was loaded after
+    ``loaded_after`` when that is given. Returns ``(loaded_at, value)``.
+    """
+
+    def __init__(self):
+        self._data = {}
+
+    def get(self, key, load, expires_in, loaded_after=None):
+        item = self._data.get(key)
+        if item is not None and _is_fresh(item[0], expires_in, loaded_after):
+            return item
+
+        loaded_at = time.time()
+        item = (loaded_at, load())
+        self._data[key] = item
+        return item
+
+    def clear(self):
+        self._data.clear()
+
+
 class BaseApp:
     client_cls = None
     OAUTH_APP_CONFIG = None
@@ -74,7 +97,7 @@ class _RequestMixin:
         request = kwargs.pop('request', None)
         withhold_token = kwargs.get('withhold_token')
         if self.api_base_url and not url.startswith(('https://', 'http://')):
-            url = urlparse.urljoin(self.api_base_url, url)
+            url = _join_api_base_url(self, url)
 
         if withhold_token:
             return session.request(method, url, **kwargs)
@@ -111,6 +134,7 @@ class OAuth1Base:
         self.authorize_params = authorize_params
         self.api_base_url = api_base_url
         self.client_kwargs = client_kwargs or {}
+        self._api_base_prefixes = _split_api_base_url(api_base_url)
 
         self._fetch_token = fetch_token
         self._user_agent = user_agent or default_user_agent
@@ -160,10 +184,7 @@ class OAuth1Mixin(_RequestMixin, OAuth1Base):
             if request_token is None:
                 raise MissingRequestTokenError()
             # merge request token with verifier
-            token = {}
-            token.update(request_token)
-            token.update(kwargs)
-            client.token = token
+            client.token = {**request_token, **kwargs}
             params = self.access_token_params or {}
             token = client.fetch_access_token(self.access_token_url, **params)
         return token
@@ -189,6 +210,7 @@ class OAuth2Base:
         self.authorize_params = authorize_params
         self.api_base_url = api_base_url
         self.client_kwargs = client_kwargs or {}
+        self._api_base_prefixes = _split_api_base_url(api_base_url)
 
         self.compliance_fix = compliance_fix
         self.client_auth_methods = client_auth_methods
@@ -198,6 +220,8 @@ class OAuth2Base:
 
         self._server_metadata_url = server_metadata_url
         self.server_metadata = kwargs
+        # documents are shared only between clients fetching them alike
+        self._connection_key = _connection_key(self.client_kwargs)
 
     def _on_update_token(self, token, refresh_token=None, access_token=None):
         raise NotImplementedError()
@@ -340,9 +364,76 @@ class OAuth2Mixin(_RequestMixin, OAuth2Base):
         with self._get_oauth_client(**metadata) as client:
             if redirect_uri is not None:
                 client.redirect_uri = redirect_uri
-            params = {}
             if self.access_token_params:
-                params.update(self.access_token_params)
-            params.update(kwargs)
+                params = {**self.access_token_params, **kwargs}
+            else:
+                params = kwargs
             token = client.fetch_token(token_endpoint, **params)
             return token
+
+
+def _is_fresh(loaded_at, expires_in, loaded_after):
+    if loaded_after is not None and loaded_at <= loaded_after:
+        return False
+    return loaded_at + expires_in > time.time()
+
+
+#: client_kwargs that decide how a shared document is fetched and trusted
+CONNECTION_KWARGS = (
+    'verify', 'cert', 'trust_env', 'proxies', 'proxy',
+    'mounts', 'transport', 'app',
+)
+
+
+def _connection_key(client_kwargs):
+    return tuple(
+        (k, _hashable(client_kwargs[k]))
+        for k in CONNECTION_KWARGS if k in client_kwargs
+    )
+
+
+def _hashable(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _split_api_base_url(api_base_url):
+    """Prepare the prefixes that ``urljoin`` would produce for absolute-path
+    and relative-path references against ``api_base_url``. The prefixes are
+    ``None`` when joining has to be left to ``urljoin``.
+    """
+    if not api_base_url:
+        return None
+    parts = urlparse.urlsplit(api_base_url)
+    path = parts.path or '/'
+    if parts.scheme not in ('http', 'https') or not parts.netloc \
+            or ';' in path or '//' in path or '/.' in path:
+        return api_base_url, None, None
+    root = f'{parts.scheme}://{parts.netloc}'
+    return api_base_url, root, root + path[:path.rindex('/') + 1]
+
+
+def _join_api_base_url(ctx, url):
+    prefixes = ctx._api_base_prefixes
+    if prefixes is None or prefixes[0] is not ctx.api_base_url:
+        prefixes = _split_api_base_url(ctx.api_base_url)
+        ctx._api_base_prefixes = prefixes
+
+    _, root, directory = prefixes
+    # plain paths can be concatenated; anything urljoin would normalize
+    # (dot segments, empty segments, schemes, params, empty queries or
+    # fragments, whitespace and control characters) falls back
+    if root is None or not url or url[0] in '.?#' or ':' in url \
+            or ';' in url or '//' in url or '/.' in url or '?#' in url \
+            or url[-1] in '?#' or ' ' in url or not url.isprintable():
+        return urlparse.urljoin(ctx.api_base_url, url)
+    if url[0] == '/':
+        return root + url
+    return directory + url
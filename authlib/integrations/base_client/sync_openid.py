@@ -1,30 +1,113 @@
+import time
+import functools
 from authlib.jose import jwt, JsonWebToken, JsonWebKey
 from authlib.oidc.core import UserInfo, CodeIDToken, ImplicitIDToken
+from .sync_app import TTLCache
 
+_jwk_set_cache = TTLCache()
 
-class OpenIDMixin:
+
+class OpenIDBase:
+    #: seconds to keep a JWK set fetched from ``jwks_uri``, shared by clients
+    JWKS_EXPIRES_IN = 3600
+
+    #: cached ``(jwk_set, keys, keys_by_kid)`` of the last imported JWK set
+    _cached_key_set = None
+    #: cached ``(alg_values, JsonWebToken)`` pair for ID token decoding
+    _cached_jwt = None
+    #: ``(jwk_set, loaded_at)`` of the last JWK set fetched from ``jwks_uri``
+    _loaded_jwk_set = None
+
+    def _import_key_set(self, jwk_set):
+        # re-import only when a different JWK set is fetched
+        cached = self._cached_key_set
+        if cached is None or cached[0] is not jwk_set:
+            keys = JsonWebKey.import_key_set(jwk_set).keys
+            keys_by_kid = {}
+            for key in keys:
+                keys_by_kid.setdefault(key.kid, key)
+            cached = (jwk_set, keys, keys_by_kid)
+            self._cached_key_set = cached
+        return cached
+
+    def _find_key(self, jwk_set, kid):
+        _, keys, keys_by_kid = self._import_key_set(jwk_set)
+        if kid is None and len(keys) == 1:
+            return keys[0]
+        key = keys_by_kid.get(kid)
+        if key is None:
+            raise ValueError('Invalid JSON Web Key Set')
+        return key
+
+    def _jwk_set_loaded_at(self, jwk_set):
+        # inline or hand-set ``jwks`` has no load time
+        loaded = self._loaded_jwk_set
+        if loaded is not None and loaded[0] is jwk_set:
+            return loaded[1]
+
+    def _jwk_set_is_usable(self, jwk_set, force):
+        if not jwk_set or force:
+            return False
+        loaded_at = self._jwk_set_loaded_at(jwk_set)
+        return loaded_at is None or loaded_at + self.JWKS_EXPIRES_IN > time.time()
+
+    def _jwk_set_loaded_after(self, jwk_set, force):
+        # a forced fetch may reuse a set that another client loaded later
+        # than this one, anything older could miss rotated keys
+        if not force:
+            return None
+        loaded_at = self._jwk_set_loaded_at(jwk_set)
+        if loaded_at is None:
+            return time.time()
+        return loaded_at
+
+    def _get_jwt(self, alg_values):
+        alg_values = tuple(alg_values)
+        cached = self._cached_jwt
+        if cached is None or cached[0] != alg_values:
+            cached = (alg_values, JsonWebToken(alg_values))
+            self._cached_jwt = cached
+        return cached[1]
+
+
+class OpenIDMixin(OpenIDBase):
     def fetch_jwk_set(self, force=False):
         metadata = self.load_server_metadata()
+        return self._fetch_jwk_set(metadata, force)
+
+    def _fetch_jwk_set(self, metadata, force=False):
         jwk_set = metadata.get('jwks')
-        if jwk_set and not force:
+        if self._jwk_set_is_usable(jwk_set, force):
             return jwk_set
 
         uri = metadata.get('jwks_uri')
         if not uri:
             raise RuntimeError('Missing "jwks_uri" in metadata')
 
+        loaded_at, jwk_set = _jwk_set_cache.get(
+            (uri, self._connection_key),
+            functools.partial(self._request_jwk_set, uri),
+            self.JWKS_EXPIRES_IN,
+            self._jwk_set_loaded_after(jwk_set, force),
+        )
+        self._loaded_jwk_set = (jwk_set, loaded_at)
+        self.server_metadata['jwks'] = jwk_set
+        return jwk_set
+
+    def _request_jwk_set(self, uri):
         with self.client_cls(**self.client_kwargs) as session:
             resp = session.request('GET', uri, withhold_token=True)
             resp.raise_for_status()
-            jwk_set = resp.json()
-
-        self.server_metadata['jwks'] = jwk_set
-        return jwk_set
+            return resp.json()
 
     def userinfo(self, **kwargs):
         """Fetch user info from ``userinfo_endpoint``."""
         metadata = self.load_server_metadata()
-        resp = self.get(metadata['userinfo_endpoint'], **kwargs)
+        userinfo_endpoint = metadata.get('userinfo_endpoint')
+        if not userinfo_endpoint:
+            raise RuntimeError('Missing "userinfo_endpoint" value')
+
+        resp = self.get(userinfo_endpoint, **kwargs)
         resp.raise_for_status()
         data = resp.json()
         return UserInfo(data)
@@ -33,26 +116,23 @@ class OpenIDMixin:
         """Return an instance of UserInfo from token's ``id_token``."""
         if 'id_token' not in token:
             return None
-        
-        load_key = self.create_load_key()
 
-        claims_params = dict(
-            nonce=nonce,
-            client_id=self.client_id,
-        )
+        metadata = self.load_server_metadata()
+        load_key = self.create_load_key(metadata)
+
+        claims_params = {'nonce': nonce, 'client_id': self.client_id}
         if 'access_token' in token:
             claims_params['access_token'] = token['access_token']
             claims_cls = CodeIDToken
         else:
             claims_cls = ImplicitIDToken
 
-        metadata = self.load_server_metadata()
         if claims_options is None and 'issuer' in metadata:
             claims_options = {'iss': {'values': [metadata['issuer']]}}
 
         alg_values = metadata.get('id_token_signing_alg_values_supported')
         if alg_values:
-            _jwt = JsonWebToken(alg_values)
+            _jwt = self._get_jwt(alg_values)
         else:
             _jwt = jwt
 
@@ -69,14 +149,16 @@ class OpenIDMixin:
         claims.validate(leeway=leeway)
         return UserInfo(claims)
 
-    def create_load_key(self):
+    def create_load_key(self, metadata=None):
+        if metadata is None:
+            metadata = self.load_server_metadata()
+
         def load_key(header, _):
-            jwk_set = JsonWebKey.import_key_set(self.fetch_jwk_set())
+            kid = header.get('kid')
             try:
-                return jwk_set.find_by_kid(header.get('kid'))
+                return self._find_key(self._fetch_jwk_set(metadata), kid)
             except ValueError:
                 # re-try with new jwk set
-                jwk_set = JsonWebKey.import_key_set(self.fetch_jwk_set(force=True))
-                return jwk_set.find_by_kid(header.get('kid'))
+                return self._find_key(self._fetch_jwk_set(metadata, force=True), kid)
 
         return load_key
@@ -1,4 +1,7 @@
-from httpx import Request
+import asyncio
+import weakref
+from urllib.request import getproxies
+from httpx import AsyncBaseTransport, AsyncHTTPTransport, Request
 
 HTTPX_CLIENT_KWARGS = [
     'headers', 'cookies', 'verify', 'cert', 'http1', 'http2',
@@ -6,6 +9,10 @@ HTTPX_CLIENT_KWARGS = [
     'event_hooks', 'base_url', 'transport', 'app', 'trust_env',
 ]
 
+HTTPX_TRANSPORT_KWARGS = [
+    'verify', 'cert', 'http1', 'http2', 'limits', 'trust_env',
+]
+
 
 def extract_client_kwargs(kwargs):
     client_kwargs = {}
@@ -28,3 +35,89 @@ def build_request(url, headers, body, initial_request: Request) -> Request:
         updated_request.extensions = initial_request.extensions
 
     return updated_request
+
+
+class SharedAsyncTransport(AsyncBaseTransport):
+    """A transport that keeps its connection pool open when the client
+    using it is closed, so that short lived clients can share keep-alive
+    connections. One pool is created for each asyncio event loop, and
+    stays open until :meth:`close_pool` is called on that loop.
+
+    Other backends, e.g. trio, share a pool only between the clients that
+    are open at the same time; it is closed when the last one exits.
+    """
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._transports = weakref.WeakKeyDictionary()
+        self._transport = None
+        self._users = 0
+
+    @classmethod
+    def from_client_kwargs(cls, client_kwargs):
+        """Create a shared transport for the given httpx client kwargs,
+        or return ``None`` if the client brings its own transport, or
+        would pick up proxies from the environment, which httpx ignores
+        once a transport is given.
+        """
+        if 'transport' in client_kwargs or 'app' in client_kwargs \
+                or 'mounts' in client_kwargs:
+            return None
+        if client_kwargs.get('trust_env', True) and _has_env_proxies():
+            return None
+        kwargs = {k: client_kwargs[k] for k in HTTPX_TRANSPORT_KWARGS if k in client_kwargs}
+        return cls(**kwargs)
+
+    def get_transport(self):
+        loop = _get_running_loop()
+        if loop is None:
+            if self._transport is None:
+                self._transport = AsyncHTTPTransport(**self._kwargs)
+            return self._transport
+
+        transport = self._transports.get(loop)
+        if transport is None:
+            transport = AsyncHTTPTransport(**self._kwargs)
+            self._transports[loop] = transport
+        return transport
+
+    async def close_pool(self):
+        """Close the connection pool of the current event loop."""
+        loop = _get_running_loop()
+        if loop is None:
+            transport, self._transport = self._transport, None
+        else:
+            transport = self._transports.pop(loop, None)
+        if transport is not None:
+            await transport.aclose()
+
+    async def handle_async_request(self, request):
+        return await self.get_transport().handle_async_request(request)
+
+    async def __aenter__(self):
+        if _get_running_loop() is None:
+            self._users += 1
+        return self
+
+    async def __aexit__(self, exc_type=None, exc_value=None, traceback=None):
+        if _get_running_loop() is None:
+            self._users -= 1
+            if not self._users:
+                await self.close_pool()
+
+    async def aclose(self):
+        # the pool outlives the clients that are closed after each call
+        pass
+
+
+def _get_running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        # not running on asyncio, e.g. trio
+        return None
+
+
+def _has_env_proxies():
+    proxies = getproxies()
+    return any(proxies.get(k) for k in ('http', 'https', 'all'))
@@ -15,6 +15,13 @@ class OAuth(BaseOAuth):
             cache=cache, fetch_token=fetch_token, update_token=update_token)
         self.config = config
 
+    async def aclose(self):
+        """Close the keep-alive connections of the created clients. Call
+        it when the application shuts down, e.g. in a lifespan handler.
+        """
+        for client in self._clients.values():
+            await client.aclose()
+
 
 __all__ = [
     'OAuth', 'OAuthError',
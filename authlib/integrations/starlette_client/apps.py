@@ -5,9 +5,25 @@ from ..base_client import BaseApp
 from ..base_client.async_app import AsyncOAuth1Mixin, AsyncOAuth2Mixin
 from ..base_client.async_openid import AsyncOpenIDMixin
 from ..httpx_client import AsyncOAuth1Client, AsyncOAuth2Client
+from ..httpx_client.utils import SharedAsyncTransport
 
 
 class StarletteAppMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # reuse keep-alive connections across the clients created per call
+        transport = SharedAsyncTransport.from_client_kwargs(self.client_kwargs)
+        if transport is not None:
+            self.client_kwargs = dict(self.client_kwargs, transport=transport)
+        self._shared_transport = transport
+
+    async def aclose(self):
+        """Close the keep-alive connections shared by this client on the
+        current event loop.
+        """
+        if self._shared_transport is not None:
+            await self._shared_transport.close_pool()
+
     async def save_authorize_data(self, request, **kwargs):
         state = kwargs.pop('state', None)
         if state:
@@ -272,6 +272,11 @@ class FlaskOAuthTest(TestCase):
         )
         self.assertRaises(RuntimeError, lambda: client.create_authorization_url(None))
 
+        client.server_metadata['authorization_endpoint'] = 'https://i.b/authorize'
+        with app.test_request_context():
+            rv = client.create_authorization_url(None)
+            self.assertTrue(rv['url'].startswith('https://i.b/authorize?'))
+
         client = oauth.register(
             'dev2',
             client_id='dev',
@@ -495,3 +500,60 @@ class FlaskOAuthTest(TestCase):
                 resp = client.get('/api/user', withhold_token=True)
                 self.assertEqual(resp.text, 'hi')
                 self.assertRaises(OAuthError, client.get, 'https://i.b/api/user')
+
+    def test_request_with_api_base_url(self):
+        app = Flask(__name__)
+        app.secret_key = '!'
+        oauth = OAuth(app)
+        client = oauth.register(
+            'dev',
+            client_id='dev',
+            client_secret='dev',
+            api_base_url='https://i.b/api/v1',
+        )
+        requested = []
+
+        def fake_send(sess, req, **kwargs):
+            requested.append(req.url)
+            resp = mock.MagicMock()
+            resp.text = 'hi'
+            resp.status_code = 200
+            return resp
+
+        urls = ['user', '/user', 'user?a=1', '../user', 'a//b', 'https://i.c/user']
+        with app.test_request_context():
+            with mock.patch('requests.sessions.Session.send', fake_send):
+                for url in urls:
+                    client.get(url, withhold_token=True)
+
+                client.api_base_url = 'https://i.b/api/'
+                client.get('user', withhold_token=True)
+
+        self.assertEqual(requested, [
+            'https://i.b/api/user',
+            'https://i.b/user',
+            'https://i.b/api/user?a=1',
+            'https://i.b/user',
+            'https://i.b/api/a/b',
+            'https://i.c/user',
+            'https://i.b/api/user',
+        ])
+
+        # urls that urlsplit would normalize, checked before requests
+        # prepares them
+        requested = []
+
+        def fake_request(sess, method, url, **kwargs):
+            requested.append(url)
+
+        urls = [
+            'user?', 'user?a=1#', '&?#x', 'b;', 'a;b/c',
+            ' user', 'user ', 'us\ter', 'user\n', '\x00user',
+        ]
+        with app.test_request_context():
+            with mock.patch('requests.sessions.Session.request', fake_request):
+                for url in urls:
+                    client.get(url, withhold_token=True)
+
+        expected = [urlparse.urljoin('https://i.b/api/', url) for url in urls]
+        self.assertEqual(requested, expected)
@@ -3,6 +3,7 @@ from flask import Flask
 from authlib.jose import JsonWebKey
 from authlib.jose.errors import InvalidClaimError
 from authlib.integrations.flask_client import OAuth
+from authlib.integrations.base_client.sync_openid import _jwk_set_cache
 from authlib.oidc.core.grants.util import generate_id_token
 from ..util import get_bearer_token, read_key_file
 
@@ -10,6 +11,10 @@ secret_key = JsonWebKey.import_key('secret', {'kty': 'oct', 'kid': 'f'})
 
 
 class FlaskUserMixinTest(TestCase):
+    def setUp(self):
+        _jwk_set_cache.clear()
+        self.addCleanup(_jwk_set_cache.clear)
+
     def test_fetch_userinfo(self):
         app = Flask(__name__)
         app.secret_key = '!'
@@ -156,3 +161,156 @@ class FlaskUserMixinTest(TestCase):
                 token['id_token'] = id_token
                 user = client.parse_id_token(token, nonce='n')
                 self.assertEqual(user.sub, '123')
+
+    def test_share_jwks_uri(self):
+        secret_keys = read_key_file('jwks_private.json')
+        token = get_bearer_token()
+        token['id_token'] = generate_id_token(
+            token, {'sub': '123'}, secret_keys,
+            alg='RS256', iss='https://i.b',
+            aud='dev', exp=3600, nonce='n',
+        )
+
+        app = Flask(__name__)
+        app.secret_key = '!'
+        oauth = OAuth(app)
+        clients = [
+            oauth.register(
+                name,
+                client_id='dev',
+                client_secret='dev',
+                jwks_uri='https://i.b/jwks',
+                issuer='https://i.b',
+            )
+            for name in ('dev1', 'dev2')
+        ]
+        requested = []
+
+        def fake_send(sess, req, **kwargs):
+            requested.append(req.url)
+            resp = mock.MagicMock()
+            resp.json = lambda: read_key_file('jwks_public.json')
+            resp.status_code = 200
+            return resp
+
+        with app.test_request_context():
+            with mock.patch('requests.sessions.Session.send', fake_send):
+                for client in clients:
+                    user = client.parse_id_token(token, nonce='n')
+                    self.assertEqual(user.sub, '123')
+                self.assertEqual(requested, ['https://i.b/jwks'])
+
+                # a forced refresh does not reuse the stale set
+                clients[0].fetch_jwk_set(force=True)
+                self.assertEqual(len(requested), 2)
+                # but picks up the set refreshed by another client
+                clients[1].fetch_jwk_set(force=True)
+                self.assertEqual(len(requested), 2)
+
+                # clients with other connection settings fetch their own
+                client = oauth.register(
+                    'dev3',
+                    client_id='dev',
+                    client_secret='dev',
+                    jwks_uri='https://i.b/jwks',
+                    issuer='https://i.b',
+                    client_kwargs={'verify': False},
+                )
+                client.fetch_jwk_set()
+                self.assertEqual(len(requested), 3)
+
+    def _create_rotating_jwks(self):
+        secret_keys = read_key_file('jwks_private.json')
+        token = get_bearer_token()
+        old_token = dict(token, id_token=generate_id_token(
+            token, {'sub': '123'}, secret_keys,
+            alg='RS256', iss='https://i.b',
+            aud='dev', exp=3600, nonce='n',
+        ))
+        new_token = dict(token, id_token=generate_id_token(
+            token, {'sub': '123'}, secret_key,
+            alg='HS256', iss='https://i.b',
+            aud='dev', exp=3600, nonce='n',
+        ))
+        served = {'jwks': read_key_file('jwks_public.json')}
+        requested = []
+
+        def fake_send(sess, req, **kwargs):
+            requested.append(req.url)
+            resp = mock.MagicMock()
+            resp.json = lambda: dict(served['jwks'])
+            resp.status_code = 200
+            return resp
+
+        def rotate():
+            served['jwks'] = {'keys': [secret_key.as_dict()]}
+
+        return old_token, new_token, fake_send, rotate, requested
+
+    def test_force_fetch_after_jwks_reloaded(self):
+        old_token, new_token, fake_send, rotate, requested = self._create_rotating_jwks()
+        app = Flask(__name__)
+        app.secret_key = '!'
+        oauth = OAuth(app)
+        clients = [
+            oauth.register(
+                name,
+                client_id='dev',
+                client_secret='dev',
+                jwks_uri='https://i.b/jwks',
+                issuer='https://i.b',
+            )
+            for name in ('dev1', 'dev2')
+        ]
+
+        clock = mock.Mock()
+        clock.time.return_value = 1000
+        with app.test_request_context(), \
+                mock.patch('requests.sessions.Session.send', fake_send), \
+                mock.patch('authlib.integrations.base_client.sync_openid.time', clock), \
+                mock.patch('authlib.integrations.base_client.sync_app.time', clock):
+            clients[0].parse_id_token(old_token, nonce='n')
+            self.assertEqual(len(requested), 1)
+
+            # the shared set expires and another client reloads it
+            clock.time.return_value += clients[0].JWKS_EXPIRES_IN
+            clients[1].parse_id_token(old_token, nonce='n')
+            self.assertEqual(len(requested), 2)
+
+            # keys rotate, the reloaded set is as old as the client's own
+            rotate()
+            user = clients[0].parse_id_token(new_token, nonce='n')
+            self.assertEqual(user.sub, '123')
+            self.assertEqual(len(requested), 3)
+
+    def test_force_fetch_with_inline_jwks(self):
+        old_token, new_token, fake_send, rotate, requested = self._create_rotating_jwks()
+        app = Flask(__name__)
+        app.secret_key = '!'
+        oauth = OAuth(app)
+        client1 = oauth.register(
+            'dev1',
+            client_id='dev',
+            client_secret='dev',
+            jwks_uri='https://i.b/jwks',
+            issuer='https://i.b',
+        )
+        client2 = oauth.register(
+            'dev2',
+            client_id='dev',
+            client_secret='dev',
+            jwks=read_key_file('jwks_public.json'),
+            jwks_uri='https://i.b/jwks',
+            issuer='https://i.b',
+        )
+
+        with app.test_request_context():
+            with mock.patch('requests.sessions.Session.send', fake_send):
+                client1.parse_id_token(old_token, nonce='n')
+                self.assertEqual(len(requested), 1)
+
+                # the cached set is no newer than the inline one
+                rotate()
+                user = client2.parse_id_token(new_token, nonce='n')
+                self.assertEqual(user.sub, '123')
+                self.assertEqual(len(requested), 2)
@@ -1,12 +1,22 @@
+import asyncio
 import pytest
 from starlette.config import Config
 from starlette.requests import Request
 from authlib.common.urls import urlparse, url_decode
 from authlib.integrations.starlette_client import OAuth, OAuthError
-from ..asgi_helper import AsyncPathMapDispatch
+from authlib.integrations.base_client.async_app import _server_metadata_cache
+from authlib.integrations.httpx_client.utils import SharedAsyncTransport
+from ..asgi_helper import AsyncMockDispatch, AsyncPathMapDispatch
 from ..util import get_bearer_token
 
 
+@pytest.fixture(autouse=True)
+def clear_server_metadata_cache():
+    _server_metadata_cache.clear()
+    yield
+    _server_metadata_cache.clear()
+
+
 def test_register_remote_app():
     oauth = OAuth()
     with pytest.raises(AttributeError):
@@ -301,3 +311,86 @@ async def test_oauth2_authorize_with_metadata():
     req = Request(req_scope)
     resp = await client.authorize_redirect(req, 'https://b.com/bar')
     assert resp.status_code == 302
+
+
+@pytest.mark.asyncio
+async def test_oauth2_share_server_metadata():
+    requested = []
+
+    async def assert_func(request):
+        requested.append(request.url.path)
+
+    app = AsyncMockDispatch({
+        'authorization_endpoint': 'https://i.b/authorize'
+    }, assert_func=assert_func)
+
+    def register(oauth, **client_kwargs):
+        return oauth.register(
+            'dev',
+            client_id='dev',
+            client_secret='dev',
+            server_metadata_url='https://i.b/.well-known/openid-configuration',
+            client_kwargs={
+                'app': app,
+                **client_kwargs,
+            }
+        )
+
+    client1 = register(OAuth())
+    client2 = register(OAuth())
+    rv = await asyncio.gather(
+        client1.load_server_metadata(),
+        client2.load_server_metadata(),
+    )
+    assert rv[0]['authorization_endpoint'] == 'https://i.b/authorize'
+    assert rv[1]['authorization_endpoint'] == 'https://i.b/authorize'
+    assert len(requested) == 1
+
+    # clients with other connection settings fetch their own
+    client3 = register(OAuth(), verify=False)
+    await client3.load_server_metadata()
+    assert len(requested) == 2
+
+    # expired metadata is fetched again
+    client1.SERVER_METADATA_EXPIRES_IN = 0
+    await client1.load_server_metadata()
+    assert len(requested) == 3
+
+
+@pytest.mark.asyncio
+async def test_oauth2_share_transport():
+    oauth = OAuth()
+    client = oauth.register(
+        'dev',
+        client_id='dev',
+        client_secret='dev',
+        api_base_url='https://i.b/api',
+    )
+    transport = client.client_kwargs['transport']
+    assert isinstance(transport, SharedAsyncTransport)
+
+    pool = transport.get_transport()
+    async with client._get_oauth_client() as session:
+        assert session._transport is transport
+    async with client._get_oauth_client() as session:
+        assert session._transport is transport
+    assert transport.get_transport() is pool
+
+    await oauth.aclose()
+    assert transport.get_transport() is not pool
+
+
+@pytest.mark.asyncio
+async def test_oauth2_env_proxies_skip_shared_transport(monkeypatch):
+    monkeypatch.setenv('HTTPS_PROXY', 'http://proxy.local:3128')
+    oauth = OAuth()
+    client = oauth.register(
+        'dev',
+        client_id='dev',
+        client_secret='dev',
+        api_base_url='https://i.b/api',
+    )
+    assert 'transport' not in client.client_kwargs
+
+    async with client._get_oauth_client() as session:
+        assert session._mounts
@@ -1,7 +1,12 @@
+import json
+import httpx
 import pytest
+from unittest import mock
 from starlette.requests import Request
 from authlib.integrations.starlette_client import OAuth
-from authlib.jose import JsonWebKey
+from authlib.integrations.base_client.async_app import _load_json
+from authlib.integrations.base_client.async_openid import _jwk_set_cache
+from authlib.jose import JsonWebKey, JsonWebToken
 from authlib.jose.errors import InvalidClaimError
 from authlib.oidc.core.grants.util import generate_id_token
 from ..util import get_bearer_token, read_key_file
@@ -10,6 +15,13 @@ from ..asgi_helper import AsyncPathMapDispatch
 secret_key = JsonWebKey.import_key('secret', {'kty': 'oct', 'kid': 'f'})
 
 
+@pytest.fixture(autouse=True)
+def clear_jwk_set_cache():
+    _jwk_set_cache.clear()
+    yield
+    _jwk_set_cache.clear()
+
+
 async def run_fetch_userinfo(payload):
     oauth = OAuth()
 
@@ -42,6 +54,43 @@ async def test_fetch_userinfo():
     await run_fetch_userinfo({'sub': '123'})
 
 
+@pytest.mark.asyncio
+async def test_fetch_userinfo_with_stdlib_json():
+    with mock.patch(
+            'authlib.integrations.base_client.async_app._json_loads',
+            wraps=json.loads) as loads:
+        await run_fetch_userinfo({'sub': '123'})
+    assert loads.call_count == 1
+
+
+def test_load_json_with_charset():
+    content = '{"sub": "123", "name": "J\u00fcrgen"}'
+    resp = httpx.Response(
+        200, content=content.encode('latin-1'),
+        headers={'Content-Type': 'application/json; charset=latin-1'},
+    )
+    assert _load_json(resp)['name'] == 'J\u00fcrgen'
+
+    resp = httpx.Response(
+        200, content=content.encode('utf-8'),
+        headers={'Content-Type': 'application/json; charset=utf-8'},
+    )
+    assert _load_json(resp)['name'] == 'J\u00fcrgen'
+
+
+@pytest.mark.asyncio
+async def test_fetch_userinfo_without_endpoint():
+    oauth = OAuth()
+    client = oauth.register(
+        'dev',
+        client_id='dev',
+        client_secret='dev',
+        fetch_token=get_bearer_token,
+    )
+    with pytest.raises(RuntimeError):
+        await client.userinfo()
+
+
 @pytest.mark.asyncio
 async def test_parse_id_token():
     token = get_bearer_token()
@@ -50,7 +99,6 @@ async def test_parse_id_token():
         alg='HS256', iss='https://i.b',
         aud='dev', exp=3600, nonce='n',
     )
-    token['id_token'] = id_token
 
     oauth = OAuth()
     client = oauth.register(
@@ -62,6 +110,9 @@ async def test_parse_id_token():
         issuer='https://i.b',
         id_token_signing_alg_values_supported=['HS256', 'RS256'],
     )
+    assert await client.parse_id_token(token, nonce='n') is None
+
+    token['id_token'] = id_token
     user = await client.parse_id_token(token, nonce='n')
     assert user.sub == '123'
 
@@ -74,6 +125,55 @@ async def test_parse_id_token():
         await client.parse_id_token(token, nonce='n', claims_options=claims_options)
 
 
+@pytest.mark.asyncio
+async def test_parse_id_token_reuse_key_set():
+    token = get_bearer_token()
+    id_token = generate_id_token(
+        token, {'sub': '123'}, secret_key,
+        alg='HS256', iss='https://i.b',
+        aud='dev', exp=3600, nonce='n',
+    )
+    token['id_token'] = id_token
+
+    app = AsyncPathMapDispatch({
+        '/reuse/jwks': {'body': {'keys': [secret_key.as_dict()]}}
+    })
+    oauth = OAuth()
+    client = oauth.register(
+        'dev',
+        client_id='dev',
+        client_secret='dev',
+        jwks={'keys': [secret_key.as_dict()]},
+        jwks_uri='https://i.b/reuse/jwks',
+        issuer='https://i.b',
+        id_token_signing_alg_values_supported=['HS256'],
+        client_kwargs={
+            'app': app,
+        }
+    )
+    with mock.patch.object(
+            JsonWebKey, 'import_key_set',
+            wraps=JsonWebKey.import_key_set) as import_key_set, \
+            mock.patch(
+                'authlib.integrations.base_client.sync_openid.JsonWebToken',
+                wraps=JsonWebToken) as jwt_cls:
+        user = await client.parse_id_token(token, nonce='n')
+        assert user.sub == '123'
+        user = await client.parse_id_token(token, nonce='n')
+        assert user.sub == '123'
+        assert import_key_set.call_count == 1
+        assert jwt_cls.call_count == 1
+
+    other_key = JsonWebKey.import_key('other', {'kty': 'oct', 'kid': 'b'})
+    token['id_token'] = generate_id_token(
+        token, {'sub': '123'}, other_key,
+        alg='HS256', iss='https://i.b',
+        aud='dev', exp=3600, nonce='n',
+    )
+    with pytest.raises(ValueError):
+        await client.parse_id_token(token, nonce='n')
+
+
 @pytest.mark.asyncio
 async def test_runtime_error_fetch_jwks_uri():
     token = get_bearer_token()
@@ -92,11 +192,9 @@ async def test_runtime_error_fetch_jwks_uri():
         issuer='https://i.b',
         id_token_signing_alg_values_supported=['HS256'],
     )
-    req_scope = {'type': 'http', 'session': {'_dev_authlib_nonce_': 'n'}}
-    req = Request(req_scope)
     token['id_token'] = id_token
     with pytest.raises(RuntimeError):
-        await client.parse_id_token(req, token)
+        await client.parse_id_token(token, nonce='n')
 
 
 @pytest.mark.asyncio
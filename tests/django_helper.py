@@ -4,9 +4,20 @@ from django.utils.module_loading import import_module
 
 
 class RequestClient(RequestFactory):
+    _session_engine = None
+
+    @classmethod
+    def _get_session_engine(cls):
+        engine = cls._session_engine
+        # re-import if SESSION_ENGINE is overridden
+        if engine is None or engine.__name__ != settings.SESSION_ENGINE:
+            engine = import_module(settings.SESSION_ENGINE)
+            cls._session_engine = engine
+        return engine
+
     @property
     def session(self):
-        engine = import_module(settings.SESSION_ENGINE)
+        engine = self._get_session_engine()
         cookie = self.cookies.get(settings.SESSION_COOKIE_NAME)
         if cookie:
             return engine.SessionStore(cookie.value)
@@ -6,16 +6,23 @@ from .oauth2_server import create_authorization_server
 
 
 class ClientCredentialsTest(TestCase):
+    CREDENTIAL_HEADERS = None
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.CREDENTIAL_HEADERS = cls.create_basic_header(
+            'credential-client', 'credential-secret'
+        )
+
     def prepare_data(self, grant_type='client_credentials'):
         server = create_authorization_server(self.app)
         server.register_grant(ClientCredentialsGrant)
         self.server = server
 
         user = User(username='foo')
-        db.session.add(user)
-        db.session.commit()
         client = Client(
-            user_id=user.id,
+            user=user,
             client_id='credential-client',
             client_secret='credential-secret',
         )
@@ -24,7 +31,7 @@ class ClientCredentialsTest(TestCase):
             'redirect_uris': ['http://localhost/authorized'],
             'grant_types': [grant_type]
         })
-        db.session.add(client)
+        db.session.add_all([user, client])
         db.session.commit()
 
     def test_invalid_client(self):
@@ -46,9 +53,7 @@ class ClientCredentialsTest(TestCase):
 
     def test_invalid_grant_type(self):
         self.prepare_data(grant_type='invalid')
-        headers = self.create_basic_header(
-            'credential-client', 'credential-secret'
-        )
+        headers = self.CREDENTIAL_HEADERS
         rv = self.client.post('/oauth/token', data={
             'grant_type': 'client_credentials',
         }, headers=headers)
@@ -58,9 +63,7 @@ class ClientCredentialsTest(TestCase):
     def test_invalid_scope(self):
         self.prepare_data()
         self.server.scopes_supported = ['profile']
-        headers = self.create_basic_header(
-            'credential-client', 'credential-secret'
-        )
+        headers = self.CREDENTIAL_HEADERS
         rv = self.client.post('/oauth/token', data={
             'grant_type': 'client_credentials',
             'scope': 'invalid',
@@ -70,9 +73,7 @@ class ClientCredentialsTest(TestCase):
 
     def test_authorize_token(self):
         self.prepare_data()
-        headers = self.create_basic_header(
-            'credential-client', 'credential-secret'
-        )
+        headers = self.CREDENTIAL_HEADERS
         rv = self.client.post('/oauth/token', data={
             'grant_type': 'client_credentials',
         }, headers=headers)
@@ -84,9 +85,7 @@ class ClientCredentialsTest(TestCase):
         self.app.config.update({'OAUTH2_ACCESS_TOKEN_GENERATOR': m})
 
         self.prepare_data()
-        headers = self.create_basic_header(
-            'credential-client', 'credential-secret'
-        )
+        headers = self.CREDENTIAL_HEADERS
         rv = self.client.post('/oauth/token', data={
             'grant_type': 'client_credentials',
         }, headers=headers)